@@ -6,16 +6,21 @@ For each chunk in lexical-chunks.js:
 1) Set TITLE_CARD_TEXT in generate.py from the `// Title` comment.
 2) Replace `phrases = [...]` in generate.py with that chunk's phrases.
 3) Run ./run.sh and wait for it to finish before moving to the next chunk.
+
+With --jobs N, up to N chunks render at once. Each job writes its own copy of
+generate.py (with OUTPUT_INDEX pinned) and runs `./run.sh --generate <copy>`.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import shlex
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 
@@ -23,10 +28,12 @@ BLOCK_RE = re.compile(
     r"^\s*//\s*(?P<title>[^\n]+)\s*$\s*^\s*const\s+\w+\s*=\s*\[(?P<body>.*?)\];",
     re.MULTILINE | re.DOTALL,
 )
-STRING_RE = re.compile(r'"((?:\\.|[^"\\])*)"')
 
 TITLE_RE = re.compile(r"^TITLE_CARD_TEXT\s*=\s*.*$", re.MULTILINE)
-PHRASES_RE = re.compile(r"^phrases\s*=\s*\[.*?^\];\s*$", re.MULTILINE | re.DOTALL)
+OUTPUT_INDEX_RE = re.compile(r"^OUTPUT_INDEX\s*=\s*.*$", re.MULTILINE)
+RENDER_THREADS_RE = re.compile(r"^RENDER_THREADS\s*=\s*.*$", re.MULTILINE)
+PHRASES_START = "\nphrases = ["
+PHRASES_END = "\n];"
 OUTPUT_DIR_RE = re.compile(r'^OUTPUT_DIR\s*=\s*["\'](?P<dir>[^"\']+)["\']', re.MULTILINE)
 
 
@@ -37,7 +44,10 @@ def parse_chunks(chunks_path: Path) -> list[tuple[str, list[str]]]:
     for match in BLOCK_RE.finditer(source):
         title = match.group("title").strip()
         body = match.group("body")
-        phrases = [json.loads(f'"{raw}"') for raw in STRING_RE.findall(body)]
+        try:
+            phrases = json.loads("[" + body.strip().rstrip(",") + "]")
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Could not parse phrases for chunk {title!r}: {exc}") from exc
         if phrases:
             chunks.append((title, phrases))
 
@@ -52,9 +62,13 @@ def format_phrases_block(phrases: list[str]) -> str:
     return "\n".join(lines)
 
 
-def update_generate_file(generate_path: Path, title: str, phrases: list[str]) -> None:
-    content = generate_path.read_text(encoding="utf-8")
-
+def update_generate_file(
+    content: str,
+    title: str,
+    phrases: list[str],
+    output_index: int | None = None,
+    render_threads: int | None = None,
+) -> str:
     new_content, title_replacements = TITLE_RE.subn(
         f"TITLE_CARD_TEXT = {json.dumps(title, ensure_ascii=False)}",
         content,
@@ -63,22 +77,39 @@ def update_generate_file(generate_path: Path, title: str, phrases: list[str]) ->
     if title_replacements != 1:
         raise RuntimeError("Could not find TITLE_CARD_TEXT in generate.py")
 
-    phrases_block = format_phrases_block(phrases)
-    new_content, phrases_replacements = PHRASES_RE.subn(
-        phrases_block, new_content, count=1
-    )
-    if phrases_replacements != 1:
+    block_start = new_content.find(PHRASES_START)
+    block_end = new_content.find(PHRASES_END, block_start)
+    if block_start == -1 or block_end == -1:
         raise RuntimeError("Could not find phrases array block in generate.py")
 
-    generate_path.write_text(new_content, encoding="utf-8")
+    new_content = (
+        new_content[: block_start + 1]
+        + format_phrases_block(phrases)
+        + new_content[block_end + len(PHRASES_END) :]
+    )
+
+    if output_index is not None:
+        new_content, index_replacements = OUTPUT_INDEX_RE.subn(
+            f"OUTPUT_INDEX = {output_index}", new_content, count=1
+        )
+        if index_replacements != 1:
+            raise RuntimeError("Could not find OUTPUT_INDEX in generate.py")
+
+    if render_threads is not None:
+        new_content, threads_replacements = RENDER_THREADS_RE.subn(
+            f"RENDER_THREADS = {render_threads}", new_content, count=1
+        )
+        if threads_replacements != 1:
+            raise RuntimeError("Could not find RENDER_THREADS in generate.py")
+
+    return new_content
 
 
-def detect_output_dir(generate_path: Path, override: str | None) -> Path:
+def detect_output_dir(generate_text: str, override: str | None) -> Path:
     if override:
         return Path(override)
 
-    content = generate_path.read_text(encoding="utf-8")
-    match = OUTPUT_DIR_RE.search(content)
+    match = OUTPUT_DIR_RE.search(generate_text)
     if match:
         return Path(match.group("dir"))
 
@@ -89,20 +120,24 @@ def infer_resume_start(output_dir: Path) -> int:
     if not output_dir.exists() or not output_dir.is_dir():
         return 1
 
-    mp4_files = [p for p in output_dir.iterdir() if p.is_file() and p.suffix.lower() == ".mp4"]
-    if not mp4_files:
-        return 1
-
-    indexed = []
-    for file_path in mp4_files:
-        prefix, sep, _rest = file_path.name.partition("-")
-        if sep and prefix.isdigit():
-            indexed.append(int(prefix))
+    max_index: int | None = None
+    mp4_count = 0
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not entry.is_file(follow_symlinks=False) or not name.lower().endswith(".mp4"):
+                continue
+            mp4_count += 1
+            prefix, sep, _rest = name.partition("-")
+            if sep and prefix.isdigit():
+                index = int(prefix)
+                if max_index is None or index > max_index:
+                    max_index = index
 
-    if indexed:
-        return max(indexed) + 1
+    if max_index is not None:
+        return max_index + 1
 
-    return len(mp4_files) + 1
+    return mp4_count + 1
 
 
 def select_chunks(
@@ -112,35 +147,128 @@ def select_chunks(
     titles: list[str] | None,
     contains: str | None,
 ) -> list[tuple[int, str, list[str]]]:
-    indexed = [(idx + 1, title, phrases) for idx, (title, phrases) in enumerate(chunks)]
-
     if start < 1:
         raise ValueError("--start must be >= 1")
 
     if end is not None and end < start:
         raise ValueError("--end must be >= --start")
 
-    filtered = [row for row in indexed if row[0] >= start and (end is None or row[0] <= end)]
+    title_set = {t.strip().lower() for t in titles} if titles else None
+    needle = contains.lower() if contains else None
 
-    if titles:
-        title_set = {t.strip().lower() for t in titles}
-        filtered = [row for row in filtered if row[1].lower() in title_set]
+    # Slicing applies the index range; each title is lowercased once for both filters
+    rows = (
+        (idx, title, phrases, title.lower())
+        for idx, (title, phrases) in enumerate(chunks[start - 1 : end], start=start)
+    )
+    return [
+        (idx, title, phrases)
+        for idx, title, phrases, lowered in rows
+        if (title_set is None or lowered in title_set) and (needle is None or needle in lowered)
+    ]
 
-    if contains:
-        needle = contains.lower()
-        filtered = [row for row in filtered if needle in row[1].lower()]
 
-    return filtered
+def uses_bundled_run_script(run_cmd: str, workdir: Path) -> bool:
+    cmd = shlex.split(run_cmd)
+    if len(cmd) != 1 or "/" not in cmd[0]:
+        return False
+    return (workdir / cmd[0]).resolve() == (workdir / "run.sh").resolve()
+
+
+def run_chunk(cmd: list[str], workdir: Path, script_path: Path, content: str) -> int:
+    script_path.write_text(content, encoding="utf-8")
+    log_path = script_path.with_suffix(".log")
+    try:
+        with log_path.open("w", encoding="utf-8") as log:
+            result = subprocess.run(
+                [*cmd, "--generate", script_path.name],
+                cwd=workdir,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+    finally:
+        script_path.unlink(missing_ok=True)
+
+    if result.returncode == 0:
+        log_path.unlink(missing_ok=True)
+    return result.returncode
+
+
+def run_parallel(
+    selected: list[tuple[int, str, list[str]]],
+    generate_text: str,
+    cmd: list[str],
+    workdir: Path,
+    output_dir: Path,
+    continue_on_error: bool,
+    jobs: int,
+) -> int:
+    jobs = min(jobs, len(selected))
+    first_index = infer_resume_start(output_dir)
+    # Split the cores between jobs so N encoders don't each claim every core
+    render_threads = max(1, (os.cpu_count() or 1) // jobs)
+    print(f"Running {len(selected)} chunks with {jobs} parallel jobs")
+    print(f"Render threads per job: {render_threads}")
+
+    exit_code = 0
+    failed: list[int] = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for pos, (idx, title, phrases) in enumerate(selected):
+            content = update_generate_file(
+                generate_text,
+                title,
+                phrases,
+                output_index=first_index + pos,
+                render_threads=render_threads,
+            )
+            script_path = workdir / f".generate-chunk-{idx}.py"
+            future = executor.submit(run_chunk, cmd, workdir, script_path, content)
+            futures[future] = (idx, title, script_path)
+
+        done = 0
+        stopping = False
+        # Keep draining after a failure so chunks that were already running get reported too
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            done += 1
+            idx, title, script_path = futures[future]
+            returncode = future.result()
+            print(f"\n[{done}/{len(selected)}] Chunk #{idx}: {title}")
+            if returncode == 0:
+                print("   Finished successfully")
+                continue
+
+            print(f"   Failed with exit code {returncode}")
+            print(f"   Log: {script_path.with_suffix('.log')}")
+            failed.append(idx)
+            if not continue_on_error and not stopping:
+                stopping = True
+                exit_code = returncode
+                for pending in futures:
+                    pending.cancel()
+                print("   Stopping: waiting for chunks that are already running")
+
+    if failed:
+        # Later chunks may have finished with higher indices, so auto-resume won't retry these
+        chunk_list = ", ".join(f"#{idx}" for idx in sorted(failed))
+        print(f"\nNot rendered: {chunk_list}. Auto-resume skips them; re-run with --start/--end.")
+
+    return exit_code
 
 
 def run_batch(
     selected: list[tuple[int, str, list[str]]],
     generate_path: Path,
+    generate_text: str,
     run_cmd: str,
     workdir: Path,
+    output_dir: Path,
     dry_run: bool,
     write_only: bool,
     continue_on_error: bool,
+    jobs: int,
 ) -> int:
     if not selected:
         print("No chunks selected.")
@@ -148,6 +276,17 @@ def run_batch(
 
     cmd = shlex.split(run_cmd)
 
+    if jobs > 1 and not dry_run and not write_only:
+        return run_parallel(
+            selected=selected,
+            generate_text=generate_text,
+            cmd=cmd,
+            workdir=workdir,
+            output_dir=output_dir,
+            continue_on_error=continue_on_error,
+            jobs=jobs,
+        )
+
     for pos, (idx, title, phrases) in enumerate(selected, start=1):
         print(f"\n[{pos}/{len(selected)}] Chunk #{idx}: {title}")
         print(f"   Phrases: {len(phrases)}")
@@ -156,7 +295,8 @@ def run_batch(
             print("   Dry-run mode: no file changes and no command execution")
             continue
 
-        update_generate_file(generate_path, title, phrases)
+        new_content = update_generate_file(generate_text, title, phrases)
+        generate_path.write_text(new_content, encoding="utf-8")
         print("   Updated generate.py")
 
         if write_only:
@@ -224,6 +364,15 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Continue with next chunk if run command fails.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of chunks to render in parallel (default: 1). Values above 1 "
+            "require the bundled run.sh as the run command, which accepts --generate <script>."
+        ),
+    )
     return parser
 
 
@@ -242,12 +391,13 @@ def main() -> int:
         print(f"Generate file not found: {generate_path}")
         return 1
 
+    generate_text = generate_path.read_text(encoding="utf-8")
     chunks = parse_chunks(chunks_path)
     if not chunks:
         print("No chunks were parsed from lexical-chunks.js")
         return 1
 
-    output_dir = detect_output_dir(generate_path, args.output_dir)
+    output_dir = detect_output_dir(generate_text, args.output_dir)
     if not output_dir.is_absolute():
         output_dir = (generate_path.parent / output_dir).resolve()
 
@@ -275,20 +425,33 @@ def main() -> int:
         )
         return 0
 
+    if args.jobs < 1:
+        print("--jobs must be >= 1")
+        return 1
+
     if args.list:
         for idx, title, phrases in selected:
             print(f"{idx:>4}: {title} ({len(phrases)} phrases)")
         print(f"\nTotal selected: {len(selected)}")
         return 0
 
+    # Dry-run and write-only never take the parallel path, so any run command is fine there
+    runs_parallel = args.jobs > 1 and not args.dry_run and not args.write_only
+    if runs_parallel and not uses_bundled_run_script(args.run_cmd, workdir):
+        print("--jobs > 1 requires --run-cmd to be the bundled run.sh (it must accept --generate)")
+        return 1
+
     return run_batch(
         selected=selected,
         generate_path=generate_path,
+        generate_text=generate_text,
         run_cmd=args.run_cmd,
         workdir=workdir,
+        output_dir=output_dir,
         dry_run=args.dry_run,
         write_only=args.write_only,
         continue_on_error=args.continue_on_error,
+        jobs=args.jobs,
     )
 
 
@@ -6,14 +6,19 @@ Usage: python generate.py
 
 import os
 import asyncio
+import hashlib
 import io
-
-# Set ImageMagick binary before importing moviepy
-os.environ["IMAGEMAGICK_BINARY"] = "/usr/bin/convert"
+import json
+import shutil
+import subprocess
+import tempfile
+from functools import lru_cache
 
 import edge_tts
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 from pydub import AudioSegment
-from moviepy import AudioFileClip, ColorClip, CompositeVideoClip, TextClip
+from moviepy import AudioFileClip, CompositeVideoClip, ImageClip, TextClip
 
 # ============================================================
 # CONFIGURATION
@@ -38,19 +43,50 @@ PROGRESS_FONT_SIZE = 40
 FONT_BOLD = "/usr/share/fonts/liberation/LiberationSans-Bold.ttf"
 FONT_REGULAR = "/usr/share/fonts/liberation/LiberationSans-Regular.ttf"
 OUTPUT_DIR = "output"  # Change this to any folder name inside the project directory
+# Index prefix for output files; None picks the highest index in OUTPUT_DIR + 1
+OUTPUT_INDEX = None
 TITLE_CARD_TEXT = "Responding to Apologies"
 OUTPUT_VIDEO = "english_phrases_video.mp4"
 OUTPUT_AUDIO = "english_phrases_audio.mp3"
 TTS_MAX_CONCURRENCY = 10
+TTS_CACHE_DIR = "tts_cache"  # Synthesized phrases are reused across runs; None disables the cache
 RENDER_THREADS = max(1, os.cpu_count() or 1)
+VIDEO_RENDERER = "ffmpeg"  # "ffmpeg" (still-image scenes) or "moviepy" (per-frame compositing)
+
+# Overlay layout, shared by both renderers. Caption boxes are (width, height).
+TITLE_FONT_SIZE = 90
+TITLE_BOX_SIZE = (VIDEO_WIDTH - 400, int(TITLE_FONT_SIZE * 2.5))  # 2 lines + ascenders
+PHRASE_BOX_SIZE = (VIDEO_WIDTH - 320, (2 * int(FONT_SIZE * 1.4)) + 80)  # Always allow up to 2 lines
+PROGRESS_COLOR = "#888888"
+PROGRESS_BOX_SIZE = (350, int(PROGRESS_FONT_SIZE * 1.8))
+PROGRESS_POSITION = (VIDEO_WIDTH - PROGRESS_BOX_SIZE[0] - 40, 40)
+COUNTER_TOP = VIDEO_HEIGHT * 0.82
 
 
 def get_output_index(output_dir):
-    """Get next index based on count of .mp4 files in output folder. Returns 1 if empty."""
+    """Get next index after the highest numeric prefix of the .mp4 files in output folder.
+
+    Falls back to the .mp4 count + 1 when no file is numbered (1 if empty). This
+    matches infer_resume_start in batch_run_chunks.py.
+    """
     if not output_dir or not os.path.isdir(output_dir):
         return 1
-    mp4_files = [f for f in os.listdir(output_dir) if f.endswith(".mp4")]
-    return len(mp4_files) + 1
+    max_index = None
+    mp4_count = 0
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not entry.is_file(follow_symlinks=False) or not name.lower().endswith(".mp4"):
+                continue
+            mp4_count += 1
+            prefix, sep, _rest = name.partition("-")
+            if sep and prefix.isdigit():
+                index = int(prefix)
+                if max_index is None or index > max_index:
+                    max_index = index
+    if max_index is not None:
+        return max_index + 1
+    return mp4_count + 1
 
 
 def sanitize_filename(text):
@@ -75,19 +111,51 @@ phrases = [
 # ============================================================
 # AUDIO GENERATION
 # ============================================================
+def write_file_atomic(path, data):
+    """Write then rename so parallel runs never read a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
 async def generate_phrase_audio(phrase, voice=VOICE, rate=RATE, output_dir=None):
     clean_phrase = phrase.replace('\\"', '"').replace('\\', '').strip()
+
+    # Cache holds decoded PCM (<key>.raw) plus its format (<key>.json), so a hit needs no decode
+    cache_base = None
+    if TTS_CACHE_DIR:
+        key = hashlib.sha1(f"{clean_phrase}|{voice}|{rate}".encode("utf-8")).hexdigest()
+        cache_base = os.path.join(TTS_CACHE_DIR, key)
+        if os.path.isfile(f"{cache_base}.json"):
+            with open(f"{cache_base}.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(f"{cache_base}.raw", "rb") as f:
+                data = f.read()
+            return AudioSegment(
+                data=data, sample_width=meta["sw"], frame_rate=meta["fr"], channels=meta["ch"]
+            )
+
     communicate = edge_tts.Communicate(clean_phrase, voice, rate=rate)
-    mp3_bytes = bytearray()
+    parts = []
 
     async for chunk in communicate.stream():
         if chunk["type"] == "audio":
-            mp3_bytes.extend(chunk["data"])
+            parts.append(chunk["data"])
 
-    if not mp3_bytes:
+    if not parts:
         raise RuntimeError(f"No audio data returned for phrase: {phrase}")
 
-    return AudioSegment.from_file(io.BytesIO(mp3_bytes), format="mp3")
+    audio = AudioSegment.from_file(io.BytesIO(b"".join(parts)), format="mp3")
+
+    if cache_base:
+        os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+        meta = {"fr": audio.frame_rate, "ch": audio.channels, "sw": audio.sample_width}
+        # Metadata goes last: its presence marks a complete entry
+        write_file_atomic(f"{cache_base}.raw", audio.raw_data)
+        write_file_atomic(f"{cache_base}.json", json.dumps(meta).encode("utf-8"))
+
+    return audio
 
 
 async def generate_phrase_audios(phrases):
@@ -115,12 +183,10 @@ async def generate_phrase_audios(phrases):
     return results
 
 
-def silence_like(duration_ms, reference_audio):
-    return (
-        AudioSegment.silent(duration=duration_ms, frame_rate=reference_audio.frame_rate)
-        .set_channels(reference_audio.channels)
-        .set_sample_width(reference_audio.sample_width)
-    )
+def silence_bytes(duration_ms, frame_rate, channels, sample_width):
+    """Raw PCM silence, rounded down to whole frames."""
+    frames = duration_ms * frame_rate // 1000
+    return bytes(frames * channels * sample_width)
 
 
 def normalize_audio_format(audio, reference_audio):
@@ -133,14 +199,32 @@ def normalize_audio_format(audio, reference_audio):
     return audio
 
 
-def concatenate_segments(segments, reference_audio):
-    joined = b"".join(segment.raw_data for segment in segments)
-    return AudioSegment(
-        data=joined,
-        sample_width=reference_audio.sample_width,
-        frame_rate=reference_audio.frame_rate,
-        channels=reference_audio.channels,
+def export_pcm_to_mp3(segments, audio_path, frame_rate, channels, sample_width):
+    """Pipe raw PCM segments straight into one ffmpeg encoder process."""
+    # pydub keeps 8-bit audio signed (it un-biases WAV's unsigned bytes on load)
+    pcm_formats = {1: "s8", 2: "s16le", 3: "s24le", 4: "s32le"}
+    if sample_width not in pcm_formats:
+        raise RuntimeError(f"Unsupported sample width: {sample_width} bytes")
+
+    proc = subprocess.Popen(
+        [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", pcm_formats[sample_width], "-ar", str(frame_rate), "-ac", str(channels),
+            "-i", "pipe:0",
+            "-b:a", "192k", audio_path,
+        ],
+        stdin=subprocess.PIPE,
     )
+    try:
+        for segment in segments:
+            proc.stdin.write(segment)
+    except BrokenPipeError:
+        pass
+    finally:
+        proc.stdin.close()
+
+    if proc.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed to encode {audio_path} (exit code {proc.returncode})")
 
 
 async def create_audio_with_timing(phrases, output_dir=None):
@@ -160,13 +244,21 @@ async def create_audio_with_timing(phrases, output_dir=None):
     if successful_phrase_audio is None:
         raise RuntimeError("Audio generation failed for all phrases.")
 
-    pause = silence_like(PAUSE_SECONDS * 1000, successful_phrase_audio)
-    short_pause = silence_like(INTER_PHRASE_PAUSE * 1000, successful_phrase_audio)
-    title_silence = silence_like(TITLE_SILENCE_SECONDS * 1000, successful_phrase_audio)
+    # Everything is concatenated as raw PCM in the reference format
+    fr = successful_phrase_audio.frame_rate
+    ch = successful_phrase_audio.channels
+    sw = successful_phrase_audio.sample_width
+    bytes_per_ms = fr * ch * sw / 1000
+
+    pause = silence_bytes(PAUSE_SECONDS * 1000, fr, ch, sw)
+    short_pause = silence_bytes(INTER_PHRASE_PAUSE * 1000, fr, ch, sw)
+    title_silence = silence_bytes(TITLE_SILENCE_SECONDS * 1000, fr, ch, sw)
+    pause_ms = round(len(pause) / bytes_per_ms)
+    short_pause_ms = round(len(short_pause) / bytes_per_ms)
 
     segments = [title_silence]
     timing = []
-    current_ms = len(title_silence)
+    current_ms = round(len(title_silence) / bytes_per_ms)
 
     for i, phrase in enumerate(phrases):
         phrase_audio, error = phrase_results[i]
@@ -174,27 +266,26 @@ async def create_audio_with_timing(phrases, output_dir=None):
             print(f"   ❌ Error on phrase {i + 1}: {phrase[:40]}... - {error}")
             continue
 
-        phrase_audio = normalize_audio_format(phrase_audio, successful_phrase_audio)
-
-        for rep in range(REPETITIONS):
-            start_ms = current_ms
-            segments.append(phrase_audio)
-            current_ms += len(phrase_audio)
-            end_ms = current_ms
-            timing.append((phrase, start_ms, end_ms, rep + 1, i + 1))
-            segments.append(pause)
-            current_ms += len(pause)
+        phrase_bytes = normalize_audio_format(phrase_audio, successful_phrase_audio).raw_data
+        phrase_ms = round(len(phrase_bytes) / bytes_per_ms)
+        rep_ms = phrase_ms + pause_ms
 
+        # Each phrase is one stanza: (phrase, pause) x REPETITIONS, then a short pause
+        timing.extend(
+            (phrase, current_ms + rep * rep_ms, current_ms + rep * rep_ms + phrase_ms, rep + 1, i + 1)
+            for rep in range(REPETITIONS)
+        )
+        segments.extend((phrase_bytes, pause) * REPETITIONS)
         segments.append(short_pause)
-        current_ms += len(short_pause)
+        current_ms += REPETITIONS * rep_ms + short_pause_ms
 
     print(f"\n💾 Saving audio to {audio_path}...")
-    combined = concatenate_segments(segments, successful_phrase_audio)
-    combined.export(audio_path, format="mp3", bitrate="192k")
-    duration_min = len(combined) / 1000 / 60
+    export_pcm_to_mp3(segments, audio_path, fr, ch, sw)
+    total_ms = round(sum(len(segment) for segment in segments) / bytes_per_ms)
+    duration_min = total_ms / 1000 / 60
     print(f"   Duration: {duration_min:.1f} minutes")
 
-    return audio_path, timing, len(combined)
+    return audio_path, timing, total_ms
 
 
 # ============================================================
@@ -207,8 +298,87 @@ def format_time(seconds):
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 
-def create_video_from_timing(audio_path, timing, total_duration_ms, output_dir=None):
+@lru_cache(maxsize=None)
+def render_background():
+    """The solid background frame, drawn once and shared by both renderers."""
+    return Image.new("RGB", (VIDEO_WIDTH, VIDEO_HEIGHT), BG_COLOR)
+
+
+_textclip_cache = {}
+
+
+def make_textclip(**kwargs):
+    """Create a 1s TextClip, reusing any earlier clip built from identical arguments."""
+    key = tuple(sorted(kwargs.items()))
+    clip = _textclip_cache.get(key)
+    if clip is None:
+        clip = TextClip(**kwargs, duration=1)
+        _textclip_cache[key] = clip
+    return clip
+
+
+def build_text_templates(phrases):
+    """Build every text overlay up front. None of them depend on audio timing."""
     total_phrases = len(phrases)
+    title_template = None
+    counter_templates = {}
+    phrase_templates = {}
+    progress_templates = {}
+
+    # === TITLE CARD (plays during silent intro, BEFORE any phrases) ===
+    try:
+        title_template = make_textclip(
+            text=TITLE_CARD_TEXT,
+            font_size=TITLE_FONT_SIZE,
+            color=ACCENT_COLOR,
+            font=FONT_BOLD,
+            method="caption",
+            size=TITLE_BOX_SIZE,  # Explicit height with padding
+            text_align="center",
+        ).with_duration(TITLE_SILENCE_SECONDS - 0.5).with_position("center").with_start(0)
+    except Exception as e:
+        print(f"   ⚠️ Title card skipped: {e}")
+
+    for rep_num in range(1, REPETITIONS + 1):
+        counter_text = f"[ {rep_num} / {REPETITIONS} ]"
+        counter_templates[rep_num] = make_textclip(
+            text=counter_text,
+            font_size=COUNTER_FONT_SIZE,
+            color=COUNTER_COLOR,
+            font=FONT_REGULAR,
+        ).with_position(("center", COUNTER_TOP))
+
+    for phrase_idx, phrase_text in enumerate(phrases, start=1):
+        phrase_templates[phrase_text] = make_textclip(
+            text=phrase_text,
+            font_size=FONT_SIZE,
+            color=TEXT_COLOR,
+            font=FONT_BOLD,
+            method="caption",
+            size=PHRASE_BOX_SIZE,
+            text_align="center",
+        ).with_position("center")
+
+        progress_text = f"Phrase {phrase_idx} / {total_phrases}"
+        progress_templates[phrase_idx] = make_textclip(
+            text=progress_text,
+            font_size=PROGRESS_FONT_SIZE,
+            color=PROGRESS_COLOR,
+            font=FONT_REGULAR,
+            method="caption",  # Use caption method with explicit size for better control
+            size=PROGRESS_BOX_SIZE,  # Explicit size prevents cutting
+            text_align="right",  # Right-align text within the container
+        ).with_position(PROGRESS_POSITION)
+
+    return {
+        "title": title_template,
+        "counter": counter_templates,
+        "phrase": phrase_templates,
+        "progress": progress_templates,
+    }
+
+
+def create_video_from_timing(audio_path, timing, total_duration_ms, templates, output_dir=None):
     total_duration_s = total_duration_ms / 1000.0
 
     if output_dir:
@@ -221,45 +391,18 @@ def create_video_from_timing(audio_path, timing, total_duration_ms, output_dir=N
     print(f"   Total duration: {format_time(total_duration_s)}")
     print(f"   Subtitle font size: {FONT_SIZE}px (BIG)")
 
-    progress_width = 350
-    progress_height = int(PROGRESS_FONT_SIZE * 1.8)
-    progress_x = VIDEO_WIDTH - progress_width - 40
-
     audio = AudioFileClip(audio_path)
-    bg = ColorClip(
-        size=(VIDEO_WIDTH, VIDEO_HEIGHT),
-        color=BG_COLOR,
-        duration=total_duration_s
-    )
+    bg = ImageClip(np.asarray(render_background())).with_duration(total_duration_s)
 
     title_clips = []
     phrase_clips = []
     counter_clips = []
     progress_clips = []
-    phrase_template_cache = {}
-    counter_template_cache = {}
-    progress_template_cache = {}
     phrase_windows = {}
 
-    # === TITLE CARD (plays during silent intro, BEFORE any phrases) ===
-    try:
-        # Calculate safe height for title (2 lines, font_size 90)
-        title_font_size = 90
-        title_safe_height = int(title_font_size * 2.5)  # Extra padding for 2 lines + ascenders
-        title = TextClip(
-            text=TITLE_CARD_TEXT,
-            font_size=title_font_size,
-            color=ACCENT_COLOR,
-            font=FONT_BOLD,
-            method="caption",
-            size=(VIDEO_WIDTH - 400, title_safe_height),  # Explicit height with padding
-            text_align="center",
-            duration=TITLE_SILENCE_SECONDS - 0.5,
-        ).with_position("center").with_start(0)
-        title_clips.append(title)
+    if templates["title"] is not None:
+        title_clips.append(templates["title"])
         print(f"   🎬 Title card: 0s to {TITLE_SILENCE_SECONDS - 0.5}s")
-    except Exception as e:
-        print(f"   ⚠️ Title card skipped: {e}")
 
     for phrase_text, start_ms, end_ms, rep_num, phrase_idx in timing:
         start_s = start_ms / 1000.0
@@ -272,18 +415,7 @@ def create_video_from_timing(audio_path, timing, total_duration_ms, output_dir=N
             window[2] = end_s
 
         event_duration = end_s - start_s
-        counter_template = counter_template_cache.get(rep_num)
-        if counter_template is None:
-            counter_text = f"[ {rep_num} / {REPETITIONS} ]"
-            counter_template = TextClip(
-                text=counter_text,
-                font_size=COUNTER_FONT_SIZE,
-                color=COUNTER_COLOR,
-                font=FONT_REGULAR,
-                duration=1,
-            ).with_position(("center", VIDEO_HEIGHT * 0.82))
-            counter_template_cache[rep_num] = counter_template
-
+        counter_template = templates["counter"][rep_num]
         counter_clips.append(counter_template.with_start(start_s).with_duration(event_duration))
 
     # === PHRASE SUBTITLES ===
@@ -291,38 +423,8 @@ def create_video_from_timing(audio_path, timing, total_duration_ms, output_dir=N
         phrase_text, start_s, end_s = phrase_windows[phrase_idx]
         duration_s = end_s - start_s
 
-        display_text = phrase_text
-
-        phrase_template = phrase_template_cache.get(display_text)
-        if phrase_template is None:
-            safe_height = (2 * int(FONT_SIZE * 1.4)) + 80  # Always allow up to 2 lines
-
-            phrase_template = TextClip(
-                text=display_text,
-                font_size=FONT_SIZE,
-                color=TEXT_COLOR,
-                font=FONT_BOLD,
-                method="caption",
-                size=(VIDEO_WIDTH - 320, safe_height),  # Dynamic height based on number of lines
-                text_align="center",
-                duration=1,
-            ).with_position("center")
-            phrase_template_cache[display_text] = phrase_template
-
-        progress_template = progress_template_cache.get(phrase_idx)
-        if progress_template is None:
-            progress_text = f"Phrase {phrase_idx} / {total_phrases}"
-            progress_template = TextClip(
-                text=progress_text,
-                font_size=PROGRESS_FONT_SIZE,
-                color="#888888",
-                font=FONT_REGULAR,
-                method="caption",  # Use caption method with explicit size for better control
-                size=(progress_width, progress_height),  # Explicit size prevents cutting
-                text_align="right",  # Right-align text within the container
-                duration=1,
-            ).with_position((progress_x, 40))
-            progress_template_cache[phrase_idx] = progress_template
+        phrase_template = templates["phrase"][phrase_text]
+        progress_template = templates["progress"][phrase_idx]
 
         phrase_clips.append(phrase_template.with_start(start_s).with_duration(duration_s))
         progress_clips.append(progress_template.with_start(start_s).with_duration(duration_s))
@@ -359,6 +461,186 @@ def create_video_from_timing(audio_path, timing, total_duration_ms, output_dir=N
     return video_path
 
 
+@lru_cache(maxsize=None)
+def load_font(path, size):
+    return ImageFont.truetype(path, size)
+
+
+def wrap_text(draw, text, font, max_width):
+    """Greedy word wrap, like moviepy's caption method."""
+    lines = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if line and draw.textlength(candidate, font=font) > max_width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def draw_caption(image, text, font, color, box, align="center"):
+    """Draw wrapped text vertically centered inside box = (x, y, width, height).
+
+    Text is drawn on a box-sized layer first, so anything that overflows the box
+    is cropped, the same as moviepy's caption method.
+    """
+    x, y, width, height = box
+    layer = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    wrapped = wrap_text(draw, text, font, width)
+    anchor_x = {"left": 0, "center": width / 2, "right": width}[align]
+    anchor = {"left": "lm", "center": "mm", "right": "rm"}[align]
+    draw.multiline_text(
+        (anchor_x, height / 2), wrapped, font=font, fill=color, anchor=anchor, align=align
+    )
+    image.paste(layer, (x, y), layer)
+
+
+def centered_box(box_size):
+    """(x, y, width, height) of a box centered on the frame, like moviepy's "center"."""
+    width, height = box_size
+    return ((VIDEO_WIDTH - width) // 2, (VIDEO_HEIGHT - height) // 2, width, height)
+
+
+def render_scene(title_visible, phrase_text, phrase_idx, rep_num):
+    """Render one still frame: background plus whichever overlays are on screen."""
+    image = render_background().copy()
+    draw = ImageDraw.Draw(image)
+
+    if title_visible:
+        draw_caption(
+            image,
+            TITLE_CARD_TEXT,
+            load_font(FONT_BOLD, TITLE_FONT_SIZE),
+            ACCENT_COLOR,
+            centered_box(TITLE_BOX_SIZE),
+        )
+
+    if phrase_text is not None:
+        draw_caption(
+            image,
+            phrase_text,
+            load_font(FONT_BOLD, FONT_SIZE),
+            TEXT_COLOR,
+            centered_box(PHRASE_BOX_SIZE),
+        )
+
+        draw_caption(
+            image,
+            f"Phrase {phrase_idx} / {len(phrases)}",
+            load_font(FONT_REGULAR, PROGRESS_FONT_SIZE),
+            PROGRESS_COLOR,
+            (*PROGRESS_POSITION, *PROGRESS_BOX_SIZE),
+            align="right",
+        )
+
+        draw.text(
+            (VIDEO_WIDTH / 2, COUNTER_TOP),
+            f"[ {rep_num} / {REPETITIONS} ]",
+            font=load_font(FONT_REGULAR, COUNTER_FONT_SIZE),
+            fill=COUNTER_COLOR,
+            anchor="mt",
+        )
+
+    return image
+
+
+def build_scene_list(timing, total_duration_s):
+    """Split the timeline into (duration_s, scene_key) runs where the picture is static."""
+    events = [(0.0, TITLE_SILENCE_SECONDS - 0.5, (True, None, None, None))]
+    for phrase_text, start_ms, end_ms, rep_num, phrase_idx in timing:
+        end_s = (end_ms / 1000.0) + PAUSE_SECONDS
+        events.append((start_ms / 1000.0, end_s, (False, phrase_text, phrase_idx, rep_num)))
+
+    blank = (False, None, None, None)
+    scenes = []
+    cursor = 0.0
+    for start_s, end_s, key in events:
+        start_s = max(start_s, cursor)
+        end_s = min(end_s, total_duration_s)
+        if start_s > cursor:
+            scenes.append((start_s - cursor, blank))
+        if end_s > start_s:
+            scenes.append((end_s - start_s, key))
+            cursor = end_s
+    if total_duration_s > cursor:
+        scenes.append((total_duration_s - cursor, blank))
+    return scenes
+
+
+def render_scene_files(phrases, scene_dir):
+    """Render every possible still frame to a PNG. Frames don't depend on audio timing."""
+    keys = [(True, None, None, None), (False, None, None, None)]
+    for phrase_idx, phrase_text in enumerate(phrases, start=1):
+        for rep_num in range(1, REPETITIONS + 1):
+            keys.append((False, phrase_text, phrase_idx, rep_num))
+
+    scene_files = {}
+    for key in keys:
+        scene_file = os.path.join(scene_dir, f"scene_{len(scene_files)}.png")
+        render_scene(*key).save(scene_file, compress_level=1)
+        scene_files[key] = scene_file
+        if len(scene_files) % 100 == 0:
+            print(f"   🖼️ Rendered {len(scene_files)}/{len(keys)} scenes")
+    return scene_files
+
+
+def create_video_with_ffmpeg(audio_path, timing, total_duration_ms, scene_files, output_dir=None):
+    """Let ffmpeg's concat demuxer time the pre-rendered still frames against the audio."""
+    total_duration_s = total_duration_ms / 1000.0
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        video_path = os.path.join(output_dir, OUTPUT_VIDEO)
+    else:
+        video_path = OUTPUT_VIDEO
+
+    print(f"\n🎬 Creating video ({VIDEO_WIDTH}x{VIDEO_HEIGHT} @ {FPS}fps)...")
+    print(f"   Total duration: {format_time(total_duration_s)}")
+    print(f"   Subtitle font size: {FONT_SIZE}px (BIG)")
+
+    scenes = build_scene_list(timing, total_duration_s)
+    concat_lines = []
+    for duration_s, key in scenes:
+        escaped = scene_files[key].replace("'", "'\\''")
+        concat_lines.append(f"file '{escaped}'")
+        concat_lines.append(f"duration {duration_s:.3f}")
+    # The concat demuxer ignores the last duration unless the final file is repeated
+    concat_lines.append(concat_lines[-2])
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        f.write("\n".join(concat_lines) + "\n")
+        concat_path = f.name
+
+    print(f"   🔧 {len(scenes)} scenes from {len(scene_files)} unique frames")
+    print(f"   💾 Rendering to {video_path}...")
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error", "-stats",
+                "-f", "concat", "-safe", "0", "-i", concat_path,
+                "-i", audio_path,
+                "-c:v", "libx264", "-tune", "stillimage", "-pix_fmt", "yuv420p",
+                "-r", str(FPS), "-preset", "ultrafast", "-b:v", "2000k",
+                "-threads", str(RENDER_THREADS),
+                "-c:a", "aac", "-shortest",
+                video_path,
+            ],
+            check=True,
+        )
+    finally:
+        os.remove(concat_path)
+
+    print(f"\n✅ Video saved: {video_path}")
+    print(f"   Resolution: {VIDEO_WIDTH}x{VIDEO_HEIGHT}")
+    print(f"   Duration: {format_time(total_duration_s)}")
+    return video_path
+
+
 # ============================================================
 # MAIN
 # ============================================================
@@ -376,7 +658,7 @@ async def main():
     output_dir = OUTPUT_DIR if OUTPUT_DIR else None
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
-        folder_index = get_output_index(output_dir)
+        folder_index = OUTPUT_INDEX or get_output_index(output_dir)
         base_title = TITLE_CARD_TEXT
         safe_title = sanitize_filename(base_title)
         OUTPUT_VIDEO = f"{folder_index}-{safe_title}.mp4"
@@ -387,8 +669,28 @@ async def main():
     else:
         print()
 
-    audio_path, timing, total_ms = await create_audio_with_timing(phrases, output_dir=output_dir)
-    video_path = create_video_from_timing(audio_path, timing, total_ms, output_dir=output_dir)
+    if VIDEO_RENDERER == "moviepy":
+        # Text overlays don't depend on the audio, so build them while TTS runs
+        (audio_path, timing, total_ms), templates = await asyncio.gather(
+            create_audio_with_timing(phrases, output_dir=output_dir),
+            asyncio.to_thread(build_text_templates, phrases),
+        )
+        video_path = create_video_from_timing(
+            audio_path, timing, total_ms, templates, output_dir=output_dir
+        )
+    else:
+        # Scene frames don't depend on the audio either, so render them while TTS runs
+        scene_dir = tempfile.mkdtemp(prefix="scenes-")
+        try:
+            (audio_path, timing, total_ms), scene_files = await asyncio.gather(
+                create_audio_with_timing(phrases, output_dir=output_dir),
+                asyncio.to_thread(render_scene_files, phrases, scene_dir),
+            )
+            video_path = create_video_with_ffmpeg(
+                audio_path, timing, total_ms, scene_files, output_dir=output_dir
+            )
+        finally:
+            shutil.rmtree(scene_dir, ignore_errors=True)
 
     print("\n" + "=" * 60)
     print("  🎉 DONE!")
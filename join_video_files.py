@@ -1,36 +1,81 @@
+import json
 import os
+import subprocess
+import tempfile
 from moviepy import VideoFileClip, concatenate_videoclips
 
+
+def probe_stream_params(path):
+    """Return the codec/format parameters that must match for a stream-copy concat."""
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error",
+            "-show_entries",
+            "stream=codec_type,codec_name,profile,width,height,pix_fmt,sample_rate,channels",
+            "-of", "json", path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    streams = json.loads(result.stdout).get("streams", [])
+    return tuple(tuple(sorted(stream.items())) for stream in streams)
+
+
 # 1. Set the directory where your videos are stored
 folder_path = "output"
 output_filename = "joined_video.mp4"
 
 # 2. Get all video files and sort them (important for chunk1, chunk2, etc.)
-files = [f for f in os.listdir(folder_path) if f.endswith(('.mp4', '.mov', '.avi'))]
-files.sort()  # This ensures chunk1 comes before chunk2
+with os.scandir(folder_path) as entries:
+    files = sorted(  # This ensures chunk1 comes before chunk2
+        entry.name
+        for entry in entries
+        if entry.is_file(follow_symlinks=False)
+        and entry.name.lower().endswith(('.mp4', '.mov', '.avi'))
+        and entry.name != output_filename  # Skip the result of a previous run
+    )
+paths = [os.path.join(folder_path, f) for f in files]
 
-# 3. Load the video clips
-clips = [VideoFileClip(os.path.join(folder_path, f)) for f in files]
-
-# 4. Concatenate (stitch) them together
-final_clip = concatenate_videoclips(clips)
-
-# 5. Write the result to a file
 output_path = os.path.join(folder_path, output_filename)
-print(f"📹 Merging {len(clips)} video files...")
+print(f"📹 Merging {len(files)} video files...")
 print(f"   Files: {', '.join(files)}")
 print(f"   Output: {output_path}")
-final_clip.write_videofile(
-    output_path,
-    codec="libx264",
-    audio_codec="aac",
-    bitrate="2000k",
-    preset="medium",
-    threads=4,
-    logger="bar",
-)
+
+# 3. If every file has the same codecs and parameters, stream-copy them (no re-encode)
+if len({probe_stream_params(p) for p in paths}) == 1:
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        for p in paths:
+            escaped = os.path.abspath(p).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+        list_path = f.name
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error", "-stats",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-c", "copy", output_path,
+            ],
+            check=True,
+        )
+    finally:
+        os.remove(list_path)
+else:
+    # 4. Parameters differ: load the clips and re-encode them together
+    print("   Stream parameters differ between files, re-encoding...")
+    clips = [VideoFileClip(p) for p in paths]
+    final_clip = concatenate_videoclips(clips)
+    final_clip.write_videofile(
+        output_path,
+        codec="libx264",
+        audio_codec="aac",
+        bitrate="2000k",
+        preset="medium",
+        threads=4,
+        logger="bar",
+    )
+    final_clip.close()
+    for clip in clips:
+        clip.close()
 
 print(f"\n✅ Video merging complete! Output saved to: {output_path}")
-final_clip.close()
-for clip in clips:
-    clip.close()
\ No newline at end of file
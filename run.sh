@@ -9,5 +9,12 @@ source venv/bin/activate
 # Ensure Python can find packages (fix for Python 3.14 venv issue)
 export PYTHONPATH="$VIRTUAL_ENV/lib/python3.14/site-packages:$PYTHONPATH"
 
+# Optional: --generate <script> runs a chunk-specific copy of generate.py
+SCRIPT="generate.py"
+if [ "$1" = "--generate" ]; then
+    SCRIPT="$2"
+    shift 2
+fi
+
 # Run the script
-python generate.py "$@"
+python "$SCRIPT" "$@"